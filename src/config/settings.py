@@ -1,7 +1,8 @@
 """Configuration settings for Zep MCP Server."""
 
-from typing import Optional, List
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property
+from typing import Annotated, FrozenSet, Optional, List
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 from pydantic import Field, field_validator, ValidationInfo
 
 
@@ -28,8 +29,8 @@ class Settings(BaseSettings):
     transport: str = Field(default="sse", description="Transport type (sse or stdio)")
     
     # User ID Configuration
-    zep_user_ids: str = Field(
-        default="aaron_whaley",
+    zep_user_ids: Annotated[List[str], NoDecode] = Field(
+        default=["aaron_whaley"],
         description="Comma-separated list of allowed user IDs"
     )
     zep_default_user_id: str = Field(
@@ -38,6 +39,10 @@ class Settings(BaseSettings):
     )
     
     log_level: str = Field(default="INFO", description="Logging level")
+    zep_log_unbuffered: bool = Field(
+        default=False,
+        description="Write debug file log records immediately instead of buffering"
+    )
     rate_limit_per_minute: int = Field(
         default=100,
         description="Rate limit per minute per user"
@@ -83,33 +88,43 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid transport: {v}")
         return v.lower()
     
+    @field_validator("zep_user_ids", mode="before")
+    @classmethod
+    def split_user_ids(cls, v):
+        """Split a comma-separated user ID string into a list."""
+        if isinstance(v, str):
+            return [uid.strip() for uid in v.split(",") if uid.strip()]
+        return v
+    
     @field_validator("zep_default_user_id")
     @classmethod
     def validate_default_user_id(cls, v, info: ValidationInfo):
         """Validate that default user ID is in allowed list."""
-        allowed_ids_str = info.data.get("zep_user_ids", "aaron_whaley")
-        if isinstance(allowed_ids_str, str):
-            allowed_ids = [uid.strip() for uid in allowed_ids_str.split(",") if uid.strip()]
-        else:
-            allowed_ids = allowed_ids_str
+        allowed_ids = info.data.get("zep_user_ids", ["aaron_whaley"])
         if v not in allowed_ids:
             raise ValueError(f"Default user ID '{v}' must be in allowed user IDs: {allowed_ids}")
         return v
     
+    @cached_property
+    def default_user_id(self) -> str:
+        """Get the default user ID for backwards compatibility."""
+        return self.zep_default_user_id
+    
+    @cached_property
+    def allowed_user_ids_set(self) -> FrozenSet[str]:
+        """Get the allowed user IDs as a frozenset for membership checks.
+        
+        Settings are immutable at runtime, so this is computed once.
+        """
+        return frozenset(self.zep_user_ids)
+    
     def is_valid_user_id(self, user_id: str) -> bool:
         """Check if a user ID is in the allowed list."""
-        return user_id in self.get_allowed_user_ids()
+        return user_id in self.allowed_user_ids_set
     
     def get_allowed_user_ids(self) -> List[str]:
-        """Get the list of allowed user IDs."""
-        if isinstance(self.zep_user_ids, str):
-            return [uid.strip() for uid in self.zep_user_ids.split(",") if uid.strip()]
-        return self.zep_user_ids
-    
-    @property
-    def default_user_id(self) -> str:
-        """Get the default user ID for backwards compatibility."""
-        return self.zep_default_user_id
+        """Get a copy of the list of allowed user IDs."""
+        return list(self.zep_user_ids)
 
 
 # Create a singleton settings instance
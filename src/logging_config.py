@@ -1,54 +1,170 @@
 """Logging configuration for Zep MCP Server."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
 
 import structlog
-from rich.console import Console
-from rich.logging import RichHandler
 
 from .config import settings
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional performance dependency
+    orjson = None
+
+
+LOG_FILE_PATH = Path.home() / "zep_mcp_server.log"
+
+# Only this package's loggers are written to the debug log file
+APP_LOGGER_NAME = __name__.partition(".")[0]
+
+# Upper bound on records waiting for the listener thread; excess records are dropped
+LOG_QUEUE_MAXSIZE = 10_000
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize a structlog event with orjson, returning str for stdlib logging."""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _build_console_handler() -> logging.Handler:
+    """Build the stderr handler for the configured transport."""
+    # stdio output is piped to the client process, so skip Rich rendering there
+    if settings.transport == "stdio":
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+        )
+        return handler
+    
+    # Configure standard logging with Rich handler, imported only when used
+    from rich.console import Console
+    from rich.highlighter import NullHighlighter
+    from rich.logging import RichHandler
+    
+    console = Console(stderr=True)
+    handler = RichHandler(
+        console=console,
+        rich_tracebacks=True,
+        tracebacks_show_locals=settings.debug,
+        markup=False,
+        highlighter=NullHighlighter(),
+        show_path=False
+    )
+    handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    return handler
+
+
+def _build_file_handler() -> logging.Handler:
+    """Build the debug file handler, buffered unless ZEP_LOG_UNBUFFERED is set.
+    
+    Records from third-party libraries are filtered out before they are
+    buffered or formatted.
+    """
+    app_filter = logging.Filter(APP_LOGGER_NAME)
+    
+    # delay=True defers opening the file until the first record is written
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE_PATH,
+        maxBytes=10_000_000,
+        backupCount=3,
+        delay=True
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    file_handler.addFilter(app_filter)
+    if settings.zep_log_unbuffered:
+        return file_handler
+    
+    # Buffer records and write them in batches; errors are flushed immediately
+    buffered_handler = logging.handlers.MemoryHandler(
+        capacity=8192,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    buffered_handler.setLevel(logging.DEBUG)
+    buffered_handler.addFilter(app_filter)
+    
+    def _flush_log_buffer(interval: float = 2.0) -> None:
+        """Periodically flush buffered log records to the log file."""
+        while True:
+            time.sleep(interval)
+            buffered_handler.flush()
+    
+    threading.Thread(target=_flush_log_buffer, name="log-flusher", daemon=True).start()
+    return buffered_handler
+
 
 def setup_logging(log_level: Optional[str] = None) -> None:
     """Configure structured logging with rich output."""
     level = log_level or settings.log_level
     
-    # Configure standard logging with Rich handler
-    console = Console(stderr=True)
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[
-            RichHandler(
-                console=console,
-                rich_tracebacks=True,
-                tracebacks_show_locals=settings.debug
-            )
-        ]
+    # Handlers run on a background listener thread; callers only enqueue records
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    
+    # Handlers attached before setup (such as run_stdio's debug file) move
+    # behind the queue; left on the root logger they would also make
+    # basicConfig below a no-op
+    root = logging.getLogger()
+    existing_handlers = list(root.handlers)
+    for handler in existing_handlers:
+        root.removeHandler(handler)
+    
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        _build_console_handler(),
+        _build_file_handler(),
+        *existing_handlers,
+        respect_handler_level=True
     )
+    # QueueHandler.prepare() bakes the formatted message into the record, so
+    # leave the prefixes to the listener's handlers
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
     
-    # Configure structlog
+    # Route structlog through the standard library so structured events are
+    # queued and written by the listener thread like every other record,
+    # reaching both the console and the debug log file. Events are rendered
+    # to JSON before they are handed to the stdlib logger.
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
+            structlog.processors.dict_tracebacks if settings.debug else structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.dict_tracebacks if settings.debug else structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+            if orjson is not None else structlog.processors.JSONRenderer(),
         ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level.upper())),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: str) -> structlog.BoundLogger:
+def get_logger(name: str) -> structlog.typing.FilteringBoundLogger:
     """Get a configured logger instance."""
     return structlog.get_logger(name)
\ No newline at end of file
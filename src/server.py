@@ -1,6 +1,9 @@
 """Zep MCP Server - Main server implementation."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from fastmcp import FastMCP
 from zep_cloud.client import Zep
@@ -18,35 +21,189 @@ from .tools import (
     list_sessions,
     update_user_metadata
 )
-from .tools.enhanced_memory_tools import (
-    get_relevant_context,
-    create_smart_session_with_context,
-    get_platform_summary
-)
 from .utils import ContextType
+from .utils.zep_client import get_client
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional performance dependency
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
 
 # Initialize logging
 setup_logging()
 logger = get_logger(__name__)
 
-# Add file logging for debugging
-import logging as std_logging
-import os
-log_file_path = os.path.join(os.path.expanduser('~'), 'zep_mcp_server.log')
-file_handler = std_logging.FileHandler(log_file_path)
-file_handler.setLevel(std_logging.DEBUG)
-file_formatter = std_logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-std_logging.getLogger().addHandler(file_handler)
+# Settings are fixed for the life of the process
+_DEFAULT_USER_ID = settings.default_user_id
+_ALLOWED_USER_IDS = settings.allowed_user_ids_set
+
+
+def _serialize_tool_result(data: Any) -> str:
+    """Serialize tool results with orjson, stringifying unknown types.
+    
+    Datetimes are encoded natively; naive ones are treated as UTC.
+    """
+    return orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC
+    ).decode()
+
+
+# Initialize FastMCP server; the serializer is only passed when orjson is
+# installed, so FastMCP's default applies otherwise
+mcp = FastMCP(
+    "zep-memory-server",
+    **({"tool_serializer": _serialize_tool_result} if orjson is not None else {})
+)
+
+
+class AddMemoryBatcher:
+    """Coalesce concurrent add_memory calls for the same session into one request.
+    
+    The first submission for a session yields once to the event loop. If no
+    other submission joined in the meantime the batch is flushed right away,
+    so a lone caller pays no extra latency. Otherwise the batch keeps
+    collecting until it reaches max_batch_size messages or max_delay elapses.
+    If a merged batch fails, each caller's messages are resent separately so
+    the failure is reported only to the callers it belongs to.
+    """
+    
+    def __init__(
+        self,
+        get_client: Callable[[], Zep],
+        max_batch_size: int = 50,
+        max_delay: float = 0.01
+    ):
+        self._get_client = get_client
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._pending: Dict[Tuple[str, Optional[str]], List[Tuple[List[Dict[str, Any]], asyncio.Future]]] = {}
+        self._full: Dict[Tuple[str, Optional[str]], asyncio.Event] = {}
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        session_id: str,
+        messages: List[Dict[str, Any]],
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Queue messages for a session and wait for the batched result."""
+        key = (session_id, user_id)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            self._full[key] = asyncio.Event()
+            task = loop.create_task(self._flush(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        batch.append((messages, future))
+        
+        if sum(len(msgs) for msgs, _ in batch) >= self._max_batch_size:
+            self._full[key].set()
+        
+        return await future
+    
+    async def _flush(self, key: Tuple[str, Optional[str]]) -> None:
+        """Wait for the batch to fill up, then send it in a single call."""
+        await asyncio.sleep(0)
+        if len(self._pending[key]) > 1 and not self._full[key].is_set():
+            try:
+                await asyncio.wait_for(self._full[key].wait(), self._max_delay)
+            except asyncio.TimeoutError:
+                pass
+        
+        batch = self._pending.pop(key)
+        del self._full[key]
+        session_id, user_id = key
+        
+        result = await self._add(session_id, [msg for msgs, _ in batch for msg in msgs], user_id)
+        if result.get("success"):
+            results = [{**result, "messages_added": len(msgs)} for msgs, _ in batch]
+        elif len(batch) == 1:
+            results = [result]
+        else:
+            # One caller's bad message must not fail everyone in the batch:
+            # resend each caller's messages on their own, in submission order
+            results = [await self._add(session_id, msgs, user_id) for msgs, _ in batch]
+        
+        for (_, future), caller_result in zip(batch, results):
+            if not future.done():
+                future.set_result(caller_result)
+    
+    async def _add(
+        self,
+        session_id: str,
+        messages: List[Dict[str, Any]],
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Send messages in one add_memory call, reporting errors as a result."""
+        try:
+            return await add_memory(self._get_client(), session_id, messages, user_id)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+
+add_memory_batcher = AddMemoryBatcher(get_client)
+
 
-# Initialize FastMCP server
-mcp = FastMCP("zep-memory-server")
+_CONTEXT_TYPES = {context_type.value: context_type for context_type in ContextType}
 
-# Initialize Zep client
-zep_client = Zep(api_key=settings.zep_api_key)
+
+def _coerce_context_type(context_type: Optional[str]) -> Optional[ContextType]:
+    """Convert a context type string to ContextType, or None if unknown."""
+    return _CONTEXT_TYPES.get(context_type) if context_type else None
+
+
+def _resolve_user_id(user_id: str, tool_name: str) -> str:
+    """Return user_id if allowed, otherwise fall back to the default user ID."""
+    logger.debug("tool_called", tool=tool_name, user_id=user_id)
+    if user_id in _ALLOWED_USER_IDS:
+        return user_id
+    logger.warning(
+        "invalid_user_id",
+        tool=tool_name,
+        user_id=user_id,
+        default_user_id=_DEFAULT_USER_ID
+    )
+    return _DEFAULT_USER_ID
+
+
+def validate_user_id(param: str = "user_id", required: bool = True):
+    """Decorate a tool so a disallowed user ID is replaced with the default.
+    
+    Args:
+        param: Name of the user ID parameter
+        required: If False, only validate when a user ID was actually given
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+        tool_name = func.__name__
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if args:
+                kwargs = signature.bind(*args, **kwargs).arguments
+            user_id = kwargs.get(param)
+            if required or user_id:
+                kwargs[param] = _resolve_user_id(user_id, tool_name)
+            return await func(**kwargs)
+        
+        return wrapper
+    
+    return decorator
 
 
 @mcp.tool()
+@validate_user_id()
 async def create_user_tool(
     user_id: str,
     first_name: Optional[str] = None,
@@ -66,17 +223,13 @@ async def create_user_tool(
     Returns:
         Created user object
     """
-    # Validate user_id is in allowed list
-    if not settings.is_valid_user_id(user_id):
-        logger.warning(f"create_user_tool: Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-        user_id = settings.default_user_id
-    
     return await create_user(
-        zep_client, user_id, first_name, last_name, email, metadata
+        get_client(), user_id, first_name, last_name, email, metadata
     )
 
 
 @mcp.tool()
+@validate_user_id()
 async def create_session_tool(
     session_id: str,
     user_id: str,
@@ -92,19 +245,11 @@ async def create_session_tool(
     Returns:
         Created session object
     """
-    # Debug logging
-    logger.warning(f"create_session_tool called with user_id: {user_id}")
-    logger.warning(f"Allowed user_ids: {settings.get_allowed_user_ids()}")
-    
-    # Validate user_id is in allowed list
-    if not settings.is_valid_user_id(user_id):
-        logger.warning(f"Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-        user_id = settings.default_user_id
-    
-    return await create_session(zep_client, session_id, user_id, metadata)
+    return await create_session(get_client(), session_id, user_id, metadata)
 
 
 @mcp.tool()
+@validate_user_id(required=False)
 async def add_memory_tool(
     session_id: str,
     messages: List[Dict[str, Any]],
@@ -120,22 +265,15 @@ async def add_memory_tool(
     Returns:
         Success status and stored message count
     """
-    # Debug logging
-    if user_id:
-        logger.warning(f"add_memory_tool called with user_id: {user_id}")
-        # Validate user_id is in allowed list
-        if not settings.is_valid_user_id(user_id):
-            logger.warning(f"Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-            user_id = settings.default_user_id
-    
-    return await add_memory(zep_client, session_id, messages, user_id)
+    return await add_memory_batcher.submit(session_id, messages, user_id)
 
 
 @mcp.tool()
 async def get_memory_tool(
     session_id: str,
     min_rating: float = 0.0,
-    limit: int = 50
+    limit: int = 50,
+    include: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """Retrieve memory for a session.
     
@@ -143,11 +281,12 @@ async def get_memory_tool(
         session_id: Session identifier
         min_rating: Minimum fact rating (0.0-1.0)
         limit: Maximum number of messages to return
+        include: Components to return ("messages", "facts", "summary", "context"); all by default
         
     Returns:
         Memory context including facts, entities, and messages
     """
-    return await get_memory(zep_client, session_id, min_rating, limit)
+    return await get_memory(get_client(), session_id, min_rating, limit, include)
 
 
 @mcp.tool()
@@ -168,10 +307,11 @@ async def search_memory_tool(
     Returns:
         List of matching memory results with relevance scores
     """
-    return await search_memory(zep_client, session_id, query, limit, search_scope)
+    return await search_memory(get_client(), session_id, query, limit, search_scope)
 
 
 @mcp.tool()
+@validate_user_id()
 async def get_facts_tool(
     user_id: str,
     min_rating: float = 0.0
@@ -185,15 +325,11 @@ async def get_facts_tool(
     Returns:
         List of facts with ratings and metadata
     """
-    # Validate user_id is in allowed list
-    if not settings.is_valid_user_id(user_id):
-        logger.warning(f"get_facts_tool: Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-        user_id = settings.default_user_id
-    
-    return await get_facts(zep_client, user_id, min_rating)
+    return await get_facts(get_client(), user_id, min_rating)
 
 
 @mcp.tool()
+@validate_user_id()
 async def list_sessions_tool(
     user_id: str,
     limit: int = 50
@@ -207,15 +343,11 @@ async def list_sessions_tool(
     Returns:
         List of user's sessions with metadata
     """
-    # Validate user_id is in allowed list
-    if not settings.is_valid_user_id(user_id):
-        logger.warning(f"list_sessions_tool: Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-        user_id = settings.default_user_id
-    
-    return await list_sessions(zep_client, user_id, limit)
+    return await list_sessions(get_client(), user_id, limit)
 
 
 @mcp.tool()
+@validate_user_id()
 async def update_user_metadata_tool(
     user_id: str,
     metadata: Dict[str, Any]
@@ -229,12 +361,7 @@ async def update_user_metadata_tool(
     Returns:
         Updated user object
     """
-    # Validate user_id is in allowed list
-    if not settings.is_valid_user_id(user_id):
-        logger.warning(f"update_user_metadata_tool: Invalid user_id '{user_id}', using default: {settings.default_user_id}")
-        user_id = settings.default_user_id
-    
-    return await update_user_metadata(zep_client, user_id, metadata)
+    return await update_user_metadata(get_client(), user_id, metadata)
 
 
 # Enhanced tools for multi-platform support
@@ -259,7 +386,9 @@ async def get_relevant_context_tool(
     Returns:
         Combined context from current and related sessions
     """
-    return await get_relevant_context(zep_client, session_id, query, limit, lookback_days, user_id)
+    from .tools.enhanced_memory_tools import get_relevant_context
+    
+    return await get_relevant_context(get_client(), session_id, query, limit, lookback_days, user_id)
 
 
 @mcp.tool()
@@ -282,14 +411,12 @@ async def create_smart_session_tool(
     Returns:
         Created session information with platform detection
     """
-    # Convert string context_type to enum
-    try:
-        context_type_enum = ContextType(context_type) if context_type else None
-    except ValueError:
-        context_type_enum = None
+    context_type_enum = _coerce_context_type(context_type)
+    
+    from .tools.enhanced_memory_tools import create_smart_session_with_context
     
     return await create_smart_session_with_context(
-        zep_client, context, context_type_enum, project, initial_messages, user_id
+        get_client(), context, context_type_enum, project, initial_messages, user_id
     )
 
 
@@ -323,7 +450,9 @@ async def get_platform_summary_tool(
     Returns:
         Summary of platform activity including sessions, contexts, and projects
     """
-    return await get_platform_summary(zep_client, platform, days, user_id)
+    from .tools.enhanced_memory_tools import get_platform_summary
+    
+    return await get_platform_summary(get_client(), platform, days, user_id)
 
 
 def main():
@@ -337,6 +466,10 @@ def main():
         transport_kwargs["host"] = settings.host
         transport_kwargs["port"] = settings.port
     
+    # Use the faster uvloop event loop when it is installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     mcp.run(transport=settings.transport, **transport_kwargs)
 
 
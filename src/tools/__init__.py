@@ -2,7 +2,7 @@
 
 from .user_tools import create_user, update_user_metadata
 from .session_tools import create_session, list_sessions
-from .memory_tools import add_memory, get_memory, search_memory, get_facts
+from .memory_tools import add_memory, get_memory, search_memory, search_memory_batch, get_facts
 
 __all__ = [
     "create_user",
@@ -12,5 +12,6 @@ __all__ = [
     "add_memory",
     "get_memory",
     "search_memory",
+    "search_memory_batch",
     "get_facts",
 ]
\ No newline at end of file
@@ -1,15 +1,21 @@
 """Enhanced memory tools with cross-platform context awareness."""
 
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 
 from zep_cloud.client import Zep
 from zep_cloud import Message
 
+from .memory_tools import search_memory_batch
+from .session_tools import get_cached_sessions, invalidate_cached_sessions
 from ..utils import (
     get_user_id, 
-    should_share_context,
+    build_share_index,
     create_smart_session,
     create_session_metadata,
     ContextType
@@ -17,6 +23,69 @@ from ..utils import (
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only stand-in for sessions without metadata
+_EMPTY_META = MappingProxyType({})
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> float:
+    """Parse an ISO 8601 timestamp to a Unix timestamp, assuming UTC if naive."""
+    return _to_timestamp(datetime.fromisoformat(value))
+
+def _to_timestamp(value: datetime) -> float:
+    """Convert a datetime to a Unix timestamp, assuming UTC if naive."""
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+def _session_timestamp(session: Any) -> Optional[float]:
+    """Get a session's creation time as a Unix timestamp, if known."""
+    # Sessions created by this server record the timestamp in their metadata
+    created_at_ts = (session.metadata or _EMPTY_META).get("created_at_ts")
+    if isinstance(created_at_ts, (int, float)):
+        return created_at_ts
+    
+    created_at = getattr(session, 'created_at', None)
+    if not created_at:
+        return None
+    if isinstance(created_at, str):
+        return _parse_iso(created_at)
+    return _to_timestamp(created_at)
+
+def _result_content(result: Any) -> str:
+    """Get the message content of a search result, or the result as text."""
+    message = getattr(result, 'message', None)
+    return message.content if message is not None else str(result)
+
+def _platform_matches(session: Any, platform: Optional[str]) -> bool:
+    """Check a session's metadata platform against an optional filter."""
+    return not platform or (session.metadata or _EMPTY_META).get("platform", "unknown") == platform
+
+async def _iter_recent_sessions(
+    client: Zep,
+    user_id: str,
+    cutoff_ts: float,
+    platform: Optional[str] = None
+) -> AsyncIterator[Any]:
+    """
+    Yield a user's sessions created at or after cutoff_ts.
+    
+    Sessions come from the user's own (cached) session list. The paged
+    memory.list_sessions endpoint is not used: it covers every user in the
+    Zep project, so even a single-user configuration on a shared project
+    would download other users' sessions. The Zep API has no metadata
+    filter for session listing, so the platform predicate is applied here.
+    
+    Args:
+        client: Zep client
+        user_id: User whose sessions to yield
+        cutoff_ts: Oldest creation time to include, as a Unix timestamp
+        platform: Only yield sessions whose metadata platform matches
+    """
+    for session in await get_cached_sessions(client, user_id):
+        session_ts = _session_timestamp(session)
+        if session_ts is not None and session_ts < cutoff_ts:
+            continue
+        if _platform_matches(session, platform):
+            yield session
+
 async def get_relevant_context(
     client: Zep,
     current_session_id: str,
@@ -47,81 +116,106 @@ async def get_relevant_context(
             "cross_platform_insights": []
         }
         
+        # Fetch current session memory and the user's sessions concurrently
+        current_memory, all_sessions = await asyncio.gather(
+            asyncio.to_thread(client.memory.get, session_id=current_session_id),
+            get_cached_sessions(client, validated_user_id),
+            return_exceptions=True
+        )
+        
         # Get current session memory
         try:
-            current_memory = client.memory.get(session_id=current_session_id)
+            if isinstance(current_memory, Exception):
+                raise current_memory
             result["current_session"] = {
                 "session_id": current_session_id,
                 "messages": [
                     {
                         "role": msg.role,
                         "content": msg.content,
-                        "created_at": str(msg.created_at) if hasattr(msg, 'created_at') else None
+                        "created_at": getattr(msg, 'created_at', None)
                     }
                     for msg in (current_memory.messages or [])[-20:]  # Last 20 messages
                 ],
-                "summary": str(current_memory.summary) if hasattr(current_memory, 'summary') and current_memory.summary else None
+                "summary": str(current_memory.summary) if getattr(current_memory, 'summary', None) else None
             }
         except Exception as e:
             logger.warning(f"Could not get current session memory: {e}")
         
         # Get all user sessions
         try:
-            all_sessions = client.user.get_sessions(user_id=validated_user_id)
+            if isinstance(all_sessions, Exception):
+                raise all_sessions
             
-            # Filter sessions by date
-            cutoff_date = datetime.now() - timedelta(days=lookback_days)
+            # Single pass: capture current metadata, filter recent sessions
+            # by date and collect cross-platform insights
+            cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).timestamp()
             recent_sessions = []
+            current_metadata = {}
+            platform_counts = Counter()
+            project_counts = Counter()
+            context_counts = Counter()
             
             for session in all_sessions:
-                # Skip current session
+                metadata = session.metadata
+                if metadata:
+                    platform_counts[metadata.get("platform", "unknown")] += 1
+                    project = metadata.get("project")
+                    if project:
+                        project_counts[project] += 1
+                    context_counts[metadata.get("context_type", "general")] += 1
+                
+                # Record current session metadata and skip it
                 if session.session_id == current_session_id:
+                    current_metadata = metadata or {}
                     continue
                 
                 # Check if session is recent enough
-                if hasattr(session, 'created_at') and session.created_at:
-                    session_date = session.created_at
-                    if isinstance(session_date, str):
-                        session_date = datetime.fromisoformat(session_date.replace('Z', '+00:00'))
-                    if session_date < cutoff_date:
-                        continue
+                session_ts = _session_timestamp(session)
+                if session_ts is not None and session_ts < cutoff_ts:
+                    continue
                 
                 recent_sessions.append(session)
             
-            # Get current session metadata
-            current_metadata = {}
-            for session in all_sessions:
-                if session.session_id == current_session_id:
-                    current_metadata = session.metadata or {}
-                    break
-            
-            # Find related sessions based on metadata
+            # Find related sessions based on metadata; the current session's
+            # sharing rules are extracted once and tested against each session
             related_sessions = []
-            for session in recent_sessions:
-                other_metadata = session.metadata or {}
-                if should_share_context(current_metadata, other_metadata):
-                    related_sessions.append(session)
+            share_predicate = build_share_index(current_metadata)
+            if not share_predicate.sensitive:
+                related_sessions = [
+                    session for session in recent_sessions
+                    if share_predicate.matches(session.metadata or _EMPTY_META)
+                ]
             
-            # Search for relevant memories across related sessions
+            # Search for relevant memories across related sessions concurrently
             if query and related_sessions:
-                for session in related_sessions[:5]:  # Limit to 5 related sessions
+                sessions_to_search = related_sessions[:5]  # Limit to 5 related sessions
+                batch_results = await search_memory_batch(client, [
+                    {
+                        "session_id": session.session_id,
+                        "text": query,
+                        "search_scope": "messages",
+                        "limit": 3
+                    }
+                    for session in sessions_to_search
+                ])
+                
+                for index, session in enumerate(sessions_to_search):
+                    search_results = batch_results[index]
                     try:
-                        search_results = client.memory.search(
-                            session_id=session.session_id,
-                            text=query,
-                            search_scope="messages",
-                            limit=3
-                        )
+                        if isinstance(search_results, Exception):
+                            raise search_results
                         
                         if search_results:
+                            meta = session.metadata or _EMPTY_META
                             result["related_sessions"].append({
                                 "session_id": session.session_id,
-                                "platform": session.metadata.get("platform", "unknown") if session.metadata else "unknown",
-                                "context": session.metadata.get("context", "unknown") if session.metadata else "unknown",
+                                "platform": meta.get("platform", "unknown"),
+                                "context": meta.get("context", "unknown"),
                                 "relevant_memories": [
                                     {
-                                        "content": res.message.content if hasattr(res, 'message') else str(res),
-                                        "score": res.score if hasattr(res, 'score') else 0.0
+                                        "content": _result_content(res),
+                                        "score": getattr(res, 'score', 0.0)
                                     }
                                     for res in search_results[:2]
                                 ]
@@ -129,22 +223,11 @@ async def get_relevant_context(
                     except Exception as e:
                         logger.debug(f"Could not search session {session.session_id}: {e}")
             
-            # Generate cross-platform insights
-            platforms_used = set()
-            projects_mentioned = set()
-            contexts_covered = set()
-            
-            for session in all_sessions:
-                if session.metadata:
-                    platforms_used.add(session.metadata.get("platform", "unknown"))
-                    if session.metadata.get("project"):
-                        projects_mentioned.add(session.metadata.get("project"))
-                    contexts_covered.add(session.metadata.get("context_type", "general"))
-            
             result["cross_platform_insights"] = {
-                "platforms_active": list(platforms_used),
-                "projects_in_progress": list(projects_mentioned),
-                "context_types": list(contexts_covered),
+                "platforms_active": list(platform_counts),
+                "top_platforms": platform_counts.most_common(),
+                "projects_in_progress": list(project_counts),
+                "context_types": list(context_counts),
                 "total_sessions": len(all_sessions),
                 "recent_sessions": len(recent_sessions)
             }
@@ -198,6 +281,7 @@ async def create_smart_session_with_context(
             user_id=validated_user_id,
             metadata=metadata
         )
+        invalidate_cached_sessions(validated_user_id)
         
         # Add initial messages if provided
         if initial_messages:
@@ -254,49 +338,40 @@ async def get_platform_summary(
     """
     try:
         validated_user_id = get_user_id(user_id)
-        all_sessions = client.user.get_sessions(user_id=validated_user_id)
         
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
         platform_stats = {}
         
-        for session in all_sessions:
-            # Check date
-            if hasattr(session, 'created_at') and session.created_at:
-                session_date = session.created_at
-                if isinstance(session_date, str):
-                    session_date = datetime.fromisoformat(session_date.replace('Z', '+00:00'))
-                if session_date < cutoff_date:
-                    continue
-            
+        async for session in _iter_recent_sessions(client, validated_user_id, cutoff_ts, platform):
             # Get platform from metadata
-            session_platform = "unknown"
-            if session.metadata and "platform" in session.metadata:
-                session_platform = session.metadata["platform"]
-            
-            # Filter by platform if specified
-            if platform and session_platform != platform:
-                continue
+            meta = session.metadata or _EMPTY_META
+            session_platform = meta.get("platform", "unknown")
             
             # Update stats
-            if session_platform not in platform_stats:
-                platform_stats[session_platform] = {
+            stats = platform_stats.get(session_platform)
+            if stats is None:
+                stats = platform_stats[session_platform] = {
                     "sessions": 0,
                     "contexts": set(),
                     "projects": set()
                 }
             
-            platform_stats[session_platform]["sessions"] += 1
+            stats["sessions"] += 1
             
-            if session.metadata:
-                if "context_type" in session.metadata:
-                    platform_stats[session_platform]["contexts"].add(session.metadata["context_type"])
-                if "project" in session.metadata:
-                    platform_stats[session_platform]["projects"].add(session.metadata["project"])
+            if "context_type" in meta:
+                stats["contexts"].add(meta["context_type"])
+            if "project" in meta:
+                stats["projects"].add(meta["project"])
         
         # Convert sets to lists for JSON serialization
-        for plat in platform_stats:
-            platform_stats[plat]["contexts"] = list(platform_stats[plat]["contexts"])
-            platform_stats[plat]["projects"] = list(platform_stats[plat]["projects"])
+        platform_stats = {
+            plat: {
+                "sessions": stats["sessions"],
+                "contexts": list(stats["contexts"]),
+                "projects": list(stats["projects"])
+            }
+            for plat, stats in platform_stats.items()
+        }
         
         return {
             "period_days": days,
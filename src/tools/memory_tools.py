@@ -1,13 +1,18 @@
 """Memory management tools for Zep MCP Server."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
 
 from zep_cloud.client import Zep
 from zep_cloud import Message
 
 logger = logging.getLogger(__name__)
 
+# Components get_memory can return
+MEMORY_COMPONENTS = frozenset({"messages", "facts", "summary", "context"})
+
 
 async def add_memory(
     client: Zep,
@@ -18,17 +23,18 @@ async def add_memory(
     """Add conversation messages to user memory."""
     try:
         # Convert message dicts to Message objects
-        message_objects = []
-        for msg in messages:
-            message = Message(
+        message_objects = [
+            Message(
                 role=msg.get("role", "user"),
                 content=msg.get("content", ""),
                 metadata=msg.get("metadata", {})
             )
-            message_objects.append(message)
+            for msg in messages
+        ]
         
-        # Add messages to memory
-        client.memory.add(
+        # Add messages to memory without blocking the event loop
+        await asyncio.to_thread(
+            client.memory.add,
             session_id=session_id,
             messages=message_objects
         )
@@ -51,21 +57,26 @@ async def get_memory(
     client: Zep,
     session_id: str,
     min_rating: float = 0.0,
-    limit: int = 50
+    limit: int = 50,
+    include: Optional[Iterable[str]] = None
 ) -> Dict[str, Any]:
-    """Retrieve memory for a session."""
+    """Retrieve memory for a session.
+    
+    Only the components named in include (messages, facts, summary,
+    context) are built; all of them are returned by default.
+    """
     try:
+        include = MEMORY_COMPONENTS if include is None else frozenset(include)
         memory = client.memory.get(session_id)
         
         # Extract data from memory object
         result = {
             "success": True,
-            "session_id": session_id,
-            "messages": []
+            "session_id": session_id
         }
         
         # Add messages if available
-        if hasattr(memory, 'messages') and memory.messages:
+        if "messages" in include:
             result["messages"] = [
                 {
                     "role": msg.role,
@@ -73,14 +84,14 @@ async def get_memory(
                     "content": msg.content,
                     "metadata": msg.metadata
                 }
-                for msg in memory.messages[:limit]
+                for msg in islice(getattr(memory, 'messages', None) or (), limit)
             ]
         
         # Add other memory components if available
-        if hasattr(memory, 'context'):
+        if "context" in include and hasattr(memory, 'context'):
             result["context"] = memory.context
         
-        if hasattr(memory, 'facts') and memory.facts:
+        if "facts" in include and getattr(memory, 'facts', None):
             # Filter facts by rating
             facts = []
             for f in memory.facts:
@@ -90,7 +101,7 @@ async def get_memory(
                         facts.append({
                             "fact": f.fact,
                             "rating": f.rating,
-                            "created_at": str(f.created_at) if hasattr(f, 'created_at') else None
+                            "created_at": str(getattr(f, 'created_at', '')) or None
                         })
                 elif isinstance(f, str):
                     # If fact is just a string, include it without rating filter
@@ -101,7 +112,7 @@ async def get_memory(
                     })
             result["facts"] = facts
         
-        if hasattr(memory, 'summary') and memory.summary:
+        if "summary" in include and getattr(memory, 'summary', None):
             result["summary"] = {
                 "content": memory.summary.content if hasattr(memory.summary, 'content') else str(memory.summary)
             }
@@ -134,23 +145,54 @@ async def search_memory(
         )
         
         logger.info(f"Searched memories for session {session_id} with query: {query}")
-        return [
-            {
+        matches = []
+        for result in results:
+            message = result.message
+            matches.append({
                 "message": {
-                    "role": result.message.role,
-                    "content": result.message.content,
-                    "metadata": result.message.metadata if hasattr(result.message, 'metadata') else {}
+                    "role": message.role,
+                    "content": message.content,
+                    "metadata": getattr(message, 'metadata', {})
                 },
-                "score": result.score if hasattr(result, 'score') else 0.0,
-                "session_id": result.session_id if hasattr(result, 'session_id') else None
-            }
-            for result in results
-        ]
+                "score": getattr(result, 'score', 0.0),
+                "session_id": getattr(result, 'session_id', None)
+            })
+        return matches
     except Exception as e:
-        logger.error(f"Error searching memory for user {user_id}: {str(e)}")
+        logger.error(f"Error searching memory for session {session_id}: {str(e)}")
         return []
 
 
+async def search_memory_batch(
+    client: Zep,
+    specs: List[Dict[str, Any]]
+) -> Dict[int, Any]:
+    """Search several sessions' memory at once.
+    
+    Zep has no batch search endpoint, so each spec is sent as its own
+    request and all requests run concurrently. Each spec holds session_id,
+    text, and optionally limit and search_scope.
+    
+    Returns:
+        Mapping of spec index to its search results, or to the exception
+        raised for that spec so one failure does not abort the batch
+    """
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                client.memory.search,
+                session_id=spec["session_id"],
+                text=spec["text"],
+                search_scope=spec.get("search_scope", "messages"),
+                limit=spec.get("limit", 10)
+            )
+            for spec in specs
+        ),
+        return_exceptions=True
+    )
+    return dict(enumerate(results))
+
+
 async def get_facts(
     client: Zep,
     user_id: str,
@@ -163,22 +205,18 @@ async def get_facts(
         facts = []
         
         # Check if response has facts
-        if hasattr(facts_response, 'facts') and facts_response.facts:
-            # Filter by rating
-            filtered_facts = [
-                f for f in facts_response.facts 
-                if f.rating >= min_rating
-            ]
-            
+        if getattr(facts_response, 'facts', None):
+            # Filter by rating while building the response rows
             facts = [
                 {
                     "fact": f.fact,
                     "rating": f.rating,
-                    "source": f.source if hasattr(f, 'source') else None,
-                    "created_at": str(f.created_at) if hasattr(f, 'created_at') else None,
-                    "metadata": f.metadata if hasattr(f, 'metadata') else {}
+                    "source": getattr(f, 'source', None),
+                    "created_at": str(getattr(f, 'created_at', '')) or None,
+                    "metadata": getattr(f, 'metadata', {})
                 }
-                for f in filtered_facts
+                for f in facts_response.facts
+                if f.rating >= min_rating
             ]
         
         logger.info(f"Retrieved {len(facts)} facts for user: {user_id}")
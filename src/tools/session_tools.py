@@ -1,13 +1,35 @@
 """Session management tools for Zep MCP Server."""
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+from cachetools import TTLCache
 from zep_cloud.client import Zep
 from zep_cloud import Session
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cache of each user's session list, shared by tools that are
+# often chained in one conversation. Kept short because other platforms
+# create sessions through their own server processes.
+SESSIONS_CACHE_TTL_SECONDS = 15
+_sessions_cache: TTLCache = TTLCache(maxsize=128, ttl=SESSIONS_CACHE_TTL_SECONDS)
+
+
+async def get_cached_sessions(client: Zep, user_id: str) -> List[Session]:
+    """Get a user's sessions, reusing a recent result if available."""
+    sessions = _sessions_cache.get(user_id)
+    if sessions is None:
+        sessions = await asyncio.to_thread(client.user.get_sessions, user_id=user_id)
+        _sessions_cache[user_id] = sessions
+    return sessions
+
+
+def invalidate_cached_sessions(user_id: str) -> None:
+    """Drop a user's cached session list after a session is created."""
+    _sessions_cache.pop(user_id, None)
+
 
 async def create_session(
     client: Zep,
@@ -37,6 +59,7 @@ async def create_session(
             user_id=user_id,
             metadata=metadata or {}
         )
+        invalidate_cached_sessions(user_id)
         
         logger.info(f"Created session: {session_id} for user: {user_id}")
         return {
@@ -63,7 +86,7 @@ async def list_sessions(
 ) -> List[Dict[str, Any]]:
     """List user's conversation sessions."""
     try:
-        sessions = client.user.get_sessions(user_id=user_id)
+        sessions = await get_cached_sessions(client, user_id)
         
         logger.info(f"Retrieved {len(sessions)} sessions for user: {user_id}")
         return [
@@ -71,8 +94,8 @@ async def list_sessions(
                 "session_id": session.session_id,
                 "user_id": session.user_id,
                 "metadata": session.metadata,
-                "created_at": str(session.created_at) if hasattr(session, 'created_at') else None,
-                "updated_at": str(session.updated_at) if hasattr(session, 'updated_at') else None
+                "created_at": str(getattr(session, 'created_at', '')) or None,
+                "updated_at": str(getattr(session, 'updated_at', '')) or None
             }
             for session in sessions
         ]
@@ -6,8 +6,12 @@ from .session_manager import (
     detect_platform,
     create_smart_session,
     create_session_metadata,
+    create_session_metadata_many,
     should_share_context,
-    get_user_id
+    SharePredicate,
+    build_share_index,
+    get_user_id,
+    try_get_user_id
 )
 
 __all__ = [
@@ -16,6 +20,10 @@ __all__ = [
     "detect_platform",
     "create_smart_session",
     "create_session_metadata",
+    "create_session_metadata_many",
     "should_share_context",
-    "get_user_id"
+    "SharePredicate",
+    "build_share_index",
+    "get_user_id",
+    "try_get_user_id"
 ]
\ No newline at end of file
@@ -1,12 +1,17 @@
 """Smart session management for multi-platform memory continuity."""
 
+import functools
+import operator
 import os
 import sys
-from datetime import datetime
-from typing import Dict, Optional, Any, List
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Any, List, FrozenSet
 from enum import Enum
 
-class Platform(Enum):
+class Platform(str, Enum):
     """Supported platforms."""
     CURSOR = "cursor"
     CLAUDE_DESKTOP = "claude_desktop"
@@ -14,7 +19,7 @@ class Platform(Enum):
     WEB_CLAUDE = "web_claude"
     UNKNOWN = "unknown"
 
-class ContextType(Enum):
+class ContextType(str, Enum):
     """Types of contexts."""
     CODING = "coding"
     GENERAL = "general"
@@ -23,38 +28,149 @@ class ContextType(Enum):
     DEBUGGING = "debugging"
     DOCUMENTATION = "documentation"
 
+# Lowercased name this process was started with
+_ARGV0_LC = sys.argv[0].lower() if sys.argv else ""
+
+# Environment variables that identify the platform when set to a non-empty value
+_ENV_RULES = (
+    ("CURSOR_SESSION", Platform.CURSOR),
+    ("CLAUDE_DESKTOP", Platform.CLAUDE_DESKTOP),
+    ("CLAUDE_CODE", Platform.CLAUDE_CODE)
+)
+
+# Process name keywords identifying a platform outright
+_PROCESS_RULES = (
+    ("cursor", Platform.CURSOR),
+)
+
+# Keywords that identify the platform once "claude" is in the process name
+_CLAUDE_SUBRULES = (
+    ("desktop", Platform.CLAUDE_DESKTOP),
+    ("code", Platform.CLAUDE_CODE)
+)
+
+def _classify(name: str) -> Optional[Platform]:
+    """Identify a platform from a lowercased process name, if possible."""
+    for keyword, platform in _PROCESS_RULES:
+        if keyword in name:
+            return platform
+    if "claude" in name:
+        for keyword, platform in _CLAUDE_SUBRULES:
+            if keyword in name:
+                return platform
+    return None
+
+@functools.lru_cache(maxsize=1)
 def detect_platform() -> Platform:
-    """Detect which platform is running the MCP server."""
+    """
+    Detect which platform is running the MCP server.
+    
+    The platform cannot change for the lifetime of the process, so the
+    result is cached; call detect_platform.cache_clear() to re-detect.
+    """
+    env = os.environ
+    
     # Check environment variables
-    if os.environ.get("CURSOR_SESSION"):
-        return Platform.CURSOR
-    if os.environ.get("CLAUDE_DESKTOP"):
-        return Platform.CLAUDE_DESKTOP
-    if os.environ.get("CLAUDE_CODE"):
-        return Platform.CLAUDE_CODE
+    for name, platform in _ENV_RULES:
+        if env.get(name):
+            return platform
     
     # Check process name
-    process_name = sys.argv[0].lower() if sys.argv else ""
-    if "cursor" in process_name:
-        return Platform.CURSOR
-    if "claude" in process_name and "desktop" in process_name:
-        return Platform.CLAUDE_DESKTOP
-    if "claude" in process_name and "code" in process_name:
-        return Platform.CLAUDE_CODE
+    platform = _classify(_ARGV0_LC)
+    if platform is not None:
+        return platform
     
     # Check parent process or other indicators
-    parent_process = os.environ.get("PARENT_PROCESS", "").lower()
-    if "cursor" in parent_process:
-        return Platform.CURSOR
-    if "claude" in parent_process:
-        if "desktop" in parent_process:
-            return Platform.CLAUDE_DESKTOP
-        elif "code" in parent_process:
-            return Platform.CLAUDE_CODE
+    platform = _classify(env.get("PARENT_PROCESS", "").lower())
+    if platform is not None:
+        return platform
     
     # Default to web claude or unknown
     return Platform.WEB_CLAUDE
 
+# Extra metadata recorded for sessions created on each platform
+_PLATFORM_META = {
+    Platform.CURSOR: {"editor": "cursor", "primary_use": "coding"},
+    Platform.CLAUDE_DESKTOP: {"interface": "desktop", "primary_use": "general"},
+    Platform.CLAUDE_CODE: {"interface": "cli", "primary_use": "coding"}
+}
+
+# Context types whose sessions share context; the relation is symmetric
+RELATED_CONTEXTS = {
+    "coding": ["debugging", "deployment", "documentation"],
+    "debugging": ["coding", "deployment"],
+    "deployment": ["coding", "debugging"],
+    "documentation": ["coding", "research"],
+    "research": ["documentation", "general"],
+    "general": ["research"]
+}
+
+# Related context type pairs in both orders, for a single membership test
+_RELATED = frozenset(
+    pair
+    for current_type, related_types in RELATED_CONTEXTS.items()
+    for other_type in related_types
+    for pair in ((current_type, other_type), (other_type, current_type))
+)
+
+# Masks are kept to 32 bits so they survive JSON readers that decode
+# numbers as float64
+_BLOOM_BITS = 32
+
+def _tag_bloom(tags: List[str]) -> int:
+    """
+    Fold tags into a 32-bit bloom mask.
+    
+    Sessions whose masks share no bits have no tags in common. Tags are
+    hashed with CRC-32 rather than hash() so masks stored in session
+    metadata stay comparable across processes.
+    
+    Args:
+        tags: Session tags
+        
+    Returns:
+        Bloom mask, 0 for no tags
+    """
+    return functools.reduce(
+        operator.or_,
+        (1 << (zlib.crc32(tag.encode()) % _BLOOM_BITS) for tag in tags),
+        0
+    )
+
+def _stored_bloom(session_metadata: Dict[str, Any]) -> Optional[int]:
+    """
+    Get a session's stored tag bloom mask, if it is usable.
+    
+    Values that are not integers below 2**32 (such as 64-bit masks written
+    by earlier versions, possibly rounded in transit) are ignored so the
+    caller falls back to comparing the tags themselves.
+    
+    Args:
+        session_metadata: Metadata of a session
+        
+    Returns:
+        Bloom mask, or None if missing or unusable
+    """
+    bloom = session_metadata.get("_tag_bloom")
+    if type(bloom) is int and 0 <= bloom < 1 << _BLOOM_BITS:
+        return bloom
+    return None
+
+# Characters replaced with underscores in session IDs
+_CTX_TRANS = str.maketrans({" ": "_", "-": "_"})
+
+# Local date used in session IDs and the timestamp at which it rolls over
+_DATE_CACHE = [0.0, ""]
+
+def _today_str() -> str:
+    """Get today's local date as YYYY_MM_DD, formatting it once per day."""
+    if time.time() >= _DATE_CACHE[0]:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        _DATE_CACHE[0] = midnight.timestamp()
+        _DATE_CACHE[1] = now.strftime("%Y_%m_%d")
+    return _DATE_CACHE[1]
+
 def create_smart_session(
     context: str, 
     context_type: Optional[ContextType] = None,
@@ -72,16 +188,48 @@ def create_smart_session(
         Session ID in format: platform_context_date
     """
     platform = detect_platform()
-    date = datetime.now().strftime("%Y_%m_%d")
+    date = _today_str()
     
     # Clean context for use in ID
-    context_clean = context.lower().replace(" ", "_").replace("-", "_")[:20]
+    context_clean = context.lower().translate(_CTX_TRANS)[:20]
     
     # Build session ID
     session_id = f"{platform.value}_{context_clean}_{date}"
     
     return session_id
 
+def _new_session_metadata(
+    platform: Platform,
+    created_at_ts: float,
+    created_at: str,
+    context: str,
+    context_type: Optional[ContextType] = None,
+    project: Optional[str] = None,
+    privacy_level: str = "normal",
+    tags: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Build session metadata from a platform and creation time already resolved."""
+    metadata = {
+        "platform": platform.value,
+        "context": context,
+        "context_type": context_type.value if context_type is not None else "general",
+        "created_at": created_at,
+        "created_at_ts": created_at_ts,
+        "privacy_level": privacy_level
+    }
+    
+    if project:
+        metadata["project"] = project
+    
+    if tags:
+        metadata["tags"] = tags
+        metadata["_tag_bloom"] = _tag_bloom(tags)
+    
+    # Add platform-specific metadata
+    metadata.update(_PLATFORM_META.get(platform, ()))
+    
+    return metadata
+
 def create_session_metadata(
     context: str,
     context_type: Optional[ContextType] = None,
@@ -102,34 +250,100 @@ def create_session_metadata(
     Returns:
         Metadata dictionary
     """
-    platform = detect_platform()
+    # created_at stays in the stored metadata for existing readers, so the
+    # ISO string is still formatted here; created_at_ts spares readers the
+    # parse (see _session_timestamp in the enhanced memory tools)
+    created_at_ts = time.time()
+    return _new_session_metadata(
+        detect_platform(),
+        created_at_ts,
+        datetime.fromtimestamp(created_at_ts).isoformat(),
+        context, context_type, project, privacy_level, tags
+    )
+
+def create_session_metadata_many(specs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create metadata for several sessions at once.
     
-    metadata = {
-        "platform": platform.value,
-        "context": context,
-        "context_type": context_type.value if context_type else "general",
-        "created_at": datetime.now().isoformat(),
-        "privacy_level": privacy_level
-    }
+    The platform and creation time are resolved once and shared by every
+    session, so bulk imports avoid repeating that work per session.
     
-    if project:
-        metadata["project"] = project
+    Args:
+        specs: Keyword arguments of create_session_metadata, one dict per session
+        
+    Returns:
+        Metadata dictionaries in the order of specs
+    """
+    platform = detect_platform()
+    created_at_ts = time.time()
+    created_at = datetime.fromtimestamp(created_at_ts).isoformat()
+    return [
+        _new_session_metadata(platform, created_at_ts, created_at, **spec)
+        for spec in specs
+    ]
+
+@dataclass(slots=True)
+class SharePredicate:
+    """The parts of one session's metadata that decide context sharing."""
+    sensitive: bool
+    project: Optional[str]
+    context_type: str
+    tag_bloom: Optional[int]
+    tags: FrozenSet[str]
     
-    if tags:
-        metadata["tags"] = tags
+    def matches(self, other_session_metadata: Dict[str, Any]) -> bool:
+        """
+        Determine if context should be shared with another session.
+        
+        Args:
+            other_session_metadata: Metadata of another session
+            
+        Returns:
+            True if context should be shared
+        """
+        # Don't share sensitive sessions
+        if self.sensitive or other_session_metadata.get("privacy_level") == "sensitive":
+            return False
+        
+        # Share if same project
+        if self.project and self.project == other_session_metadata.get("project"):
+            return True
+        
+        # Share if related context types
+        if (self.context_type, other_session_metadata.get("context_type", "general")) in _RELATED:
+            return True
+        
+        # Share if common tags; an untagged current session or disjoint
+        # bloom masks rule that out without touching the other session's tags
+        if not self.tags:
+            return False
+        
+        other_bloom = _stored_bloom(other_session_metadata)
+        if self.tag_bloom is not None and other_bloom is not None and not self.tag_bloom & other_bloom:
+            return False
+        
+        other_tags = other_session_metadata.get("tags")
+        return bool(other_tags and not self.tags.isdisjoint(other_tags))
+
+def build_share_index(current_session_metadata: Dict[str, Any]) -> SharePredicate:
+    """
+    Extract what should_share_context needs from the current session once.
     
-    # Add platform-specific metadata
-    if platform == Platform.CURSOR:
-        metadata["editor"] = "cursor"
-        metadata["primary_use"] = "coding"
-    elif platform == Platform.CLAUDE_DESKTOP:
-        metadata["interface"] = "desktop"
-        metadata["primary_use"] = "general"
-    elif platform == Platform.CLAUDE_CODE:
-        metadata["interface"] = "cli"
-        metadata["primary_use"] = "coding"
+    Use this when testing many sessions against the same current session.
     
-    return metadata
+    Args:
+        current_session_metadata: Metadata of current session
+        
+    Returns:
+        Predicate whose matches() tests another session's metadata
+    """
+    return SharePredicate(
+        sensitive=current_session_metadata.get("privacy_level") == "sensitive",
+        project=current_session_metadata.get("project"),
+        context_type=current_session_metadata.get("context_type", "general"),
+        tag_bloom=_stored_bloom(current_session_metadata),
+        tags=frozenset(current_session_metadata.get("tags") or ())
+    )
 
 def should_share_context(
     current_session_metadata: Dict[str, Any],
@@ -145,43 +359,42 @@ def should_share_context(
     Returns:
         True if context should be shared
     """
-    # Don't share sensitive sessions
-    if (current_session_metadata.get("privacy_level") == "sensitive" or 
-        other_session_metadata.get("privacy_level") == "sensitive"):
-        return False
-    
-    # Share if same project
-    if (current_session_metadata.get("project") and 
-        current_session_metadata.get("project") == other_session_metadata.get("project")):
-        return True
-    
-    # Share if related context types
-    current_type = current_session_metadata.get("context_type", "general")
-    other_type = other_session_metadata.get("context_type", "general")
-    
-    # Define related context types
-    related_contexts = {
-        "coding": ["debugging", "deployment", "documentation"],
-        "debugging": ["coding", "deployment"],
-        "deployment": ["coding", "debugging"],
-        "documentation": ["coding", "research"],
-        "research": ["documentation", "general"],
-        "general": ["research"]
-    }
+    return build_share_index(current_session_metadata).matches(other_session_metadata)
+
+_settings = None
+
+def _get_settings():
+    """
+    Get the application settings, importing them on first use.
+    
+    The import is deferred so the utils package itself does not build
+    Settings at import time, and is bound once instead of per call.
+    """
+    global _settings
+    if _settings is None:
+        from ..config import settings
+        _settings = settings
+    return _settings
+
+def try_get_user_id(user_id: Optional[str] = None) -> Optional[str]:
+    """
+    Get a validated user ID without raising.
     
-    if current_type in related_contexts.get(other_type, []):
-        return True
-    if other_type in related_contexts.get(current_type, []):
-        return True
+    Args:
+        user_id: Optional specific user ID to validate and use
+        
+    Returns:
+        The default user ID if user_id is None, user_id if it is allowed,
+        otherwise None
+    """
+    settings = _get_settings()
     
-    # Share if common tags
-    current_tags = set(current_session_metadata.get("tags", []))
-    other_tags = set(other_session_metadata.get("tags", []))
-    if current_tags and other_tags and current_tags.intersection(other_tags):
-        return True
+    if user_id is None:
+        return settings.default_user_id
     
-    return False
+    return user_id if user_id in settings.allowed_user_ids_set else None
 
+@functools.lru_cache(maxsize=32)
 def get_user_id(user_id: Optional[str] = None) -> str:
     """
     Get a validated user ID.
@@ -195,12 +408,9 @@ def get_user_id(user_id: Optional[str] = None) -> str:
     Raises:
         ValueError: If provided user_id is not in allowed list
     """
-    from ..config import settings
-    
-    if user_id is None:
-        return settings.default_user_id
+    validated_user_id = try_get_user_id(user_id)
     
-    if not settings.is_valid_user_id(user_id):
-        raise ValueError(f"User ID '{user_id}' is not in allowed list: {settings.allowed_user_ids}")
+    if validated_user_id is None:
+        raise ValueError(f"User ID '{user_id}' is not in allowed list: {_get_settings().get_allowed_user_ids()}")
     
-    return user_id
\ No newline at end of file
+    return validated_user_id
\ No newline at end of file
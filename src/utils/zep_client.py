@@ -0,0 +1,36 @@
+"""Shared Zep client with a pooled keep-alive HTTP connection."""
+
+import atexit
+import functools
+
+import httpx
+from zep_cloud.client import Zep
+
+from ..config import settings
+
+
+def build_pooled_client() -> httpx.Client:
+    """Build a keep-alive HTTP client shared by all Zep API calls."""
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.max_concurrent_requests,
+            max_keepalive_connections=max(1, settings.max_concurrent_requests // 2),
+            keepalive_expiry=60.0
+        ),
+        timeout=settings.request_timeout_seconds
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> Zep:
+    """Get the process-wide Zep client, creating it on first use."""
+    http_client = build_pooled_client()
+    atexit.register(http_client.close)
+    # The SDK sends its own per-request timeout, which is None (no timeout)
+    # when a custom httpx client is passed without one
+    return Zep(
+        api_key=settings.zep_api_key,
+        httpx_client=http_client,
+        timeout=settings.request_timeout_seconds
+    )